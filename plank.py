@@ -10,6 +10,9 @@ from typing import List, Dict, Tuple, Optional
 from collections import Counter as GradeCounter
 import json
 
+# 결과 파일 저장 디렉토리 (현재 스크립트 위치 기준, 모듈 로드 시 한 번만 계산)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+
 # MediaPipe Pose 모델 초기화
 mp_pose = mp.solutions.pose
 pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
@@ -457,6 +460,9 @@ def run_plank_analysis(duration_seconds=120, stop_callback=None, frame_callback=
     Args:
         duration_seconds (int): 분석할 시간 (초), 기본값 120초 (2분)
         stop_callback (callable): 분석 중지 여부를 확인하는 콜백 함수
+            (프레임 처리 루프에서 매 프레임 확인하므로, 중지 요청 후 현재 프레임만 마치고 종료됨)
+        frame_callback (callable): 처리된 프레임을 GUI로 전달하는 콜백 함수
+            (복사 없이 원본 배열을 넘기므로, 콜백은 반환 전에 프레임 사용을 마치거나 직접 복사해야 함)
     """
     
     # 중지 플래그 초기화
@@ -496,8 +502,7 @@ def run_plank_analysis(duration_seconds=120, stop_callback=None, frame_callback=
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     
     # output 디렉토리 생성 및 확인 (현재 스크립트 위치 기준)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, "output")
+    output_dir = OUTPUT_DIR
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"output 디렉토리를 생성했습니다: {output_dir}")
@@ -546,6 +551,12 @@ def run_plank_analysis(duration_seconds=120, stop_callback=None, frame_callback=
     tts_manager.add_feedback("시작", "encouragement")
     
     while cap.isOpened():
+        # 분석 중지 체크 (전역 변수 또는 콜백 함수로 제어)
+        # 루프 맨 앞에서 확인해 사람 미검출/처리 오류로 continue 되는 프레임에서도 매 프레임 1회 확인
+        if getattr(run_plank_analysis, '_stop_analysis', False) or (stop_callback and stop_callback()):
+            print("분석이 중지되었습니다.")
+            break
+
         try:
             ret, frame = cap.read()
             if not ret: 
@@ -579,6 +590,10 @@ def run_plank_analysis(duration_seconds=120, stop_callback=None, frame_callback=
         # 포즈 랜드마크가 감지되지 않은 경우 건너뛰기
         if not results.pose_landmarks:
             print("포즈 랜드마크가 감지되지 않았습니다. 카메라 앞에 사람이 있는지 확인하세요.")
+
+            # GUI로 프레임 전달 (사람이 없어도 미리보기가 멈추지 않도록)
+            if frame_callback:
+                frame_callback(image)
             continue
             
         try:
@@ -697,7 +712,7 @@ def run_plank_analysis(duration_seconds=120, stop_callback=None, frame_callback=
                                 mp_drawing.DrawingSpec(color=(245,66,230), thickness=2, circle_radius=2))               
         
         if frame_callback:
-            frame_callback(image.copy())
+            frame_callback(image)
         
         out.write(image)
         
@@ -758,16 +773,6 @@ def run_plank_analysis(duration_seconds=120, stop_callback=None, frame_callback=
         if int(time.time()) % 5 == 0 and int(time.time()) != getattr(locals(), '_last_status_time', 0):
             print(f"플랭크 분석 진행 중... 시간: {remaining_time:.1f}초")
             _last_status_time = int(time.time())
-        
-        # 분석 중지 체크 (전역 변수로 제어)
-        if hasattr(run_plank_analysis, '_stop_analysis') and run_plank_analysis._stop_analysis:
-            print("분석이 중지되었습니다.")
-            break
-
-        # 분석 중지 체크 (콜백 함수로 제어)
-        if stop_callback and stop_callback():
-            print("분석이 중지되었습니다.")
-            break
 
     # 마지막 홀드 세션 저장
     if is_holding:
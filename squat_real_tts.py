@@ -6,15 +6,67 @@ import time
 import threading
 import queue
 import subprocess
-from typing import List, Dict, Tuple, Optional
+from typing import List, Tuple, Optional, Iterable
 from collections import Counter as GradeCounter
 import json
+import math
+from dataclasses import dataclass
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import platform
+from functools import lru_cache
+
+# Numba JIT (선택사항) - 설치되어 있지 않으면 순수 파이썬으로 동작
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# 젯슨 감지 (ARM64 + Linux) - 모듈 로드 시 한 번만 수행
+IS_JETSON = platform.system() == "Linux" and platform.machine() in ("aarch64", "arm64")
+
+# OpenCV T-API(OpenCL) 사용 여부 - OpenCL을 지원하지 않는 환경에서는 ndarray 경로 사용
+try:
+    USE_UMAT = cv2.ocl.haveOpenCL()
+    cv2.ocl.setUseOpenCL(USE_UMAT)
+except Exception:
+    USE_UMAT = False
+
+# 결과 파일 저장 디렉토리 (현재 스크립트 위치 기준, 모듈 로드 시 한 번만 계산)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 
 # MediaPipe Pose 모델 초기화
 mp_pose = mp.solutions.pose
 pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
 mp_drawing = mp.solutions.drawing_utils
 
+# 스켈레톤 그리기 스타일 (매 프레임 새로 만들지 않도록 한 번만 생성)
+LANDMARK_DRAWING_SPEC = mp_drawing.DrawingSpec(color=(245, 117, 66), thickness=2, circle_radius=2)
+CONNECTION_DRAWING_SPEC = mp_drawing.DrawingSpec(color=(245, 66, 230), thickness=2, circle_radius=2)
+
+# 각도 계산에 사용하는 랜드마크 (compute_all_angles의 pts 행 순서와 동일)
+ANGLE_LANDMARK_KEYS = (
+    'left_shoulder', 'left_hip', 'left_knee', 'left_ankle', 'left_foot_index',
+    'right_shoulder', 'right_hip', 'right_knee', 'right_ankle', 'right_foot_index',
+)
+ANGLE_LANDMARK_IDS = tuple(mp_pose.PoseLandmark[key.upper()].value for key in ANGLE_LANDMARK_KEYS)
+
+# 각도 캐시 키 양자화 배율 (0.1픽셀 단위)
+ANGLE_CACHE_SCALE = 10
+
+# 측정 측면(좌/우) 전환 히스테리시스: 가시성 차이가 충분하고 연속 프레임 동안 유지될 때만 전환
+SIDE_SWITCH_MARGIN = 0.15
+SIDE_SWITCH_FRAMES = 3
+
+# MediaPipe 추론 주기 (N프레임마다 1회 추론, 나머지 프레임은 직전 랜드마크 재사용)
+INFER_EVERY = 2
+
+# MediaPipe 추론 입력 최대 너비 (랜드마크는 정규화 좌표이므로 원본 해상도에 그대로 적용됨)
+INFER_WIDTH = 480
+
 class UniversalTTS:
     """모든 플랫폼에서 작동하는 TTS 시스템 (하이브리드 접근법)"""
 
@@ -542,19 +594,51 @@ class UniversalTTS:
 
         print("=" * 60 + "\n")
 
-def calculate_angle(a: list, b: list, c: list) -> float:
-    """세 점 사이의 각도를 계산하는 함수 (결과값: 0-180)"""
-    a = np.array(a)
-    b = np.array(b)
-    c = np.array(c)
+@njit(cache=True, fastmath=True)
+def compute_all_angles(pts, use_left):
+    """한 프레임의 엉덩이/무릎/발목/상체 각도를 한 번에 계산하는 함수 (결과값: 0-180)
 
-    radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - np.arctan2(a[1] - b[1], a[0] - b[0])
-    angle = np.abs(radians * 180.0 / np.pi)
-
-    if angle > 180.0:
-        angle = 360 - angle
-
-    return angle
+    Args:
+        pts: ANGLE_LANDMARK_KEYS 순서의 (10, 2) 픽셀 좌표 배열
+        use_left (bool): True면 왼쪽(0-4행), False면 오른쪽(5-9행) 사용
+    """
+    o = 0 if use_left else 5
+    sx, sy = pts[o, 0], pts[o, 1]
+    hx, hy = pts[o + 1, 0], pts[o + 1, 1]
+    kx, ky = pts[o + 2, 0], pts[o + 2, 1]
+    ax, ay = pts[o + 3, 0], pts[o + 3, 1]
+    fx, fy = pts[o + 4, 0], pts[o + 4, 1]
+
+    # 엉덩이: 어깨-엉덩이-무릎
+    hip = abs((math.atan2(ky - hy, kx - hx) - math.atan2(sy - hy, sx - hx)) * 180.0 / math.pi)
+    if hip > 180.0:
+        hip = 360.0 - hip
+
+    # 무릎: 엉덩이-무릎-발목
+    knee = abs((math.atan2(ay - ky, ax - kx) - math.atan2(hy - ky, hx - kx)) * 180.0 / math.pi)
+    if knee > 180.0:
+        knee = 360.0 - knee
+
+    # 발목: 무릎-발목-발끝
+    ankle = abs((math.atan2(fy - ay, fx - ax) - math.atan2(ky - ay, kx - ax)) * 180.0 / math.pi)
+    if ankle > 180.0:
+        ankle = 360.0 - ankle
+
+    # 상체: 엉덩이-어깨-(어깨 바로 위 수직점)
+    torso = abs((math.atan2(-1.0, 0.0) - math.atan2(hy - sy, hx - sx)) * 180.0 / math.pi)
+    if torso > 180.0:
+        torso = 360.0 - torso
+
+    return hip, knee, ankle, torso
+
+@lru_cache(maxsize=256)
+def compute_angles_cached(quantized_pts: tuple) -> Tuple[float, float, float, float]:
+    """양자화된 한쪽 측면 좌표(어깨, 엉덩이, 무릎, 발목, 발끝)로 각도를 계산하고 캐시하는 함수
+
+    정지 자세(READY, BOTTOM 유지 등)에서는 같은 좌표가 반복되므로 캐시에서 바로 반환됩니다.
+    """
+    pts = np.array(quantized_pts, dtype=np.float32).reshape(5, 2) / ANGLE_CACHE_SCALE
+    return compute_all_angles(pts, True)
 
 class ComprehensiveSquatGrader:
     """
@@ -624,8 +708,8 @@ class ComprehensiveSquatGrader:
 
         return errors
 
-    def get_grade_from_errors(self, errors: List[str]) -> str:
-        """오류 개수에 따라 등급을 반환합니다."""
+    def get_grade_from_errors(self, errors: Iterable[str]) -> str:
+        """오류 개수에 따라 등급을 반환합니다. (list, tuple, set 모두 가능)"""
         num_errors = len(set(errors))
         if num_errors == 0: return "A"
         elif num_errors == 1: return "B"
@@ -652,9 +736,17 @@ ERROR_CRITERIA_MAP = {
     "발목 가동성 부족": "발목 가동성 부족 (Ankle Mobility): 스쿼트 최저점에서 발목 각도(배굴곡)가 충분하지 않은 경우."
 }
 
-def save_report(report_path: str, total_reps: int, results: List[Dict]):
+@dataclass
+class RepResult:
+    """한 회차 스쿼트의 평가 결과"""
+    __slots__ = ('rep', 'grade', 'errors')
+    rep: int
+    grade: str
+    errors: Tuple[str, ...]
+
+def save_report(report_path: str, total_reps: int, results: List[RepResult]):
     """분석 결과와 전체 평가 기준을 텍스트 파일로 저장합니다."""
-    grades = [res['grade'] for res in results]
+    grades = [res.grade for res in results]
     grade_counts = GradeCounter(grades)
 
     with open(report_path, 'w', encoding='utf-8') as f:
@@ -670,10 +762,10 @@ def save_report(report_path: str, total_reps: int, results: List[Dict]):
         f.write("\n" + "=" * 50 + "\n")
         f.write("반복별 상세 결과:\n")
         for res in results:
-            f.write(f"\n--- {res['rep']}회차: 등급 {res['grade']} ---\n")
-            if res['errors']:
+            f.write(f"\n--- {res.rep}회차: 등급 {res.grade} ---\n")
+            if res.errors:
                 f.write("  [수행하지 못한 기준]\n")
-                for error_key in sorted(res['errors']):
+                for error_key in sorted(res.errors):
                     error_description = ERROR_CRITERIA_MAP.get(error_key, "알 수 없는 오류")
                     f.write(f"  - {error_description}\n")
             else:
@@ -700,13 +792,76 @@ def save_report(report_path: str, total_reps: int, results: List[Dict]):
 
     print(f"리포트가 '{report_path}'에 저장되었습니다.")
 
-def run_squat_analysis(duration_seconds=120, stop_callback=None, frame_callback=None):
+class AsyncVideoWriter:
+    """cv2.VideoWriter 인코딩을 별도 스레드에서 처리하는 래퍼 (분석 루프가 인코딩을 기다리지 않도록)
+
+    write()에 넘긴 프레임은 인코딩이 끝날 때까지 수정하면 안 됩니다.
+    """
+
+    def __init__(self, writer, maxsize: int = 8):
+        self.writer = writer
+        self.write_queue = queue.Queue(maxsize=maxsize)
+        self.write_thread = threading.Thread(target=self._write_worker, daemon=True)
+        self.write_thread.start()
+
+    def _write_worker(self):
+        """큐에서 프레임을 꺼내 인코딩하는 워커 스레드"""
+        while True:
+            frame = self.write_queue.get()
+            if frame is None:
+                break
+            try:
+                self.writer.write(frame)
+            except Exception as e:
+                print(f"영상 저장 오류: {e}")
+
+    def write(self, frame: np.ndarray):
+        """프레임을 인코딩 큐에 추가 (큐가 가득 차면 대기)"""
+        self.write_queue.put(frame)
+
+    def release(self):
+        """남은 프레임을 모두 인코딩한 뒤 VideoWriter를 닫습니다."""
+        self.write_queue.put(None)
+        self.write_thread.join()
+        self.writer.release()
+
+def build_overlay_templates(frame_width: int, frame_height: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """프레임마다 변하지 않는 오버레이(상단/하단 박스와 고정 라벨)를 미리 그려서 반환합니다.
+
+    Returns:
+        (ui_top, ui_top_idle, ui_bottom): 분석 중 상단 박스, 사람 미검출 시 상단 박스, 하단 안내 박스
+    """
+    ui_top = np.full((120, frame_width, 3), (245, 117, 16), dtype=np.uint8)
+    ui_top_idle = ui_top.copy()
+
+    cv2.putText(ui_top, 'REPS', (int(frame_width * 0.3), 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255),
+                2, cv2.LINE_AA)
+    cv2.putText(ui_top, 'PHASE', (int(frame_width * 0.5), 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255),
+                2, cv2.LINE_AA)
+    cv2.putText(ui_top, 'GRADE', (int(frame_width * 0.7), 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
+                (255, 255, 255), 2, cv2.LINE_AA)
+    cv2.putText(ui_top, 'TTS: ON', (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2, cv2.LINE_AA)
+
+    cv2.putText(ui_top_idle, 'No Person Detected', (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2,
+                cv2.LINE_AA)
+
+    # 하단 박스는 프레임 하단 50px 기준 좌표(frame_height - 20)를 박스 내부 좌표(30)로 옮겨 그림
+    ui_bottom = np.zeros((50, frame_width, 3), dtype=np.uint8)
+    cv2.putText(ui_bottom, 'Press Q to quit early | TTS Feedback Active', (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2, cv2.LINE_AA)
+
+    return ui_top, ui_top_idle, ui_bottom
+
+def run_squat_analysis(duration_seconds=120, stop_callback=None, frame_callback=None, draw_skeleton=True):
     """실시간 카메라를 통한 스쿼트 분석 함수 (TTS 피드백 포함)
     
     Args:
         duration_seconds (int): 분석할 시간 (초), 기본값 120초 (2분)
         stop_callback (callable): 분석 중지 여부를 확인하는 콜백 함수
+            (프레임 처리 루프에서 매 프레임 확인하므로, 중지 요청 후 현재 프레임만 마치고 종료됨)
         frame_callback (callable): 처리된 프레임을 GUI로 전달하는 콜백 함수
+            (복사 없이 원본 배열을 넘기므로, 콜백은 반환 전에 프레임 사용을 마치거나 직접 복사해야 함)
+        draw_skeleton (bool): 스켈레톤 오버레이 표시 여부 (False면 그리기 생략)
     """
     
     # 중지 플래그 초기화
@@ -746,8 +901,7 @@ def run_squat_analysis(duration_seconds=120, stop_callback=None, frame_callback=
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     
     # output 디렉토리 생성 및 확인 (현재 스크립트 위치 기준)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, "output")
+    output_dir = OUTPUT_DIR
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"output 디렉토리를 생성했습니다: {output_dir}")
@@ -757,7 +911,8 @@ def run_squat_analysis(duration_seconds=120, stop_callback=None, frame_callback=
     output_video_path = os.path.join(output_dir, f"squat_realtime_tts_analysis_{timestamp}.mp4")
     output_report_path = os.path.join(output_dir, f"squat_realtime_tts_report_{timestamp}.txt")
     
-    out = cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height))
+    # 인코딩은 별도 스레드에서 처리 (cap.read()가 매 프레임 새 배열을 반환하므로 복사 없이 전달)
+    out = AsyncVideoWriter(cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height)))
     
     try:
         # TTS 피드백 매니저 초기화
@@ -774,8 +929,23 @@ def run_squat_analysis(duration_seconds=120, stop_callback=None, frame_callback=
         all_rep_results = []
         current_rep_errors = set()
         last_rep_grade = "N/A"
+
+        # 현재 회차 등급 캐시 (오류 집합이 바뀐 경우에만 다시 계산)
+        errors_changed = True
+        current_grade = "A"
         rep_start_hip_y = 0
-        
+
+        # 화면 오버레이의 고정 부분은 한 번만 그려둠
+        ui_top, ui_top_idle, ui_bottom = build_overlay_templates(frame_width, frame_height)
+
+        # 각도 계산용 좌표 버퍼 및 JIT 워밍업 (루프 진입 전에 컴파일)
+        pts = np.zeros((len(ANGLE_LANDMARK_KEYS), 2), dtype=np.float32)
+        compute_all_angles(pts, True)
+
+        # 측정 측면 상태 (히스테리시스 적용)
+        use_left_side = None
+        side_switch_count = 0
+
         print("초기화 완료!")
         
     except Exception as e:
@@ -796,264 +966,328 @@ def run_squat_analysis(duration_seconds=120, stop_callback=None, frame_callback=
     # 시작 안내 메시지
     tts_manager.add_feedback("시작", "encouragement")
     
-    while cap.isOpened():
-        try:
-            ret, frame = cap.read()
-            if not ret: 
-                print("프레임을 읽을 수 없습니다.")
-                break
+    # 다음 상태 출력 시각
+    next_status_time = time.monotonic() + 5.0
+
+    # 현재 동작 단계 (첫 랜드마크 감지 전에는 READY 표시)
+    current_phase = "READY"
+
+    # 루프에서 반복 사용하는 이름/상수를 로컬에 미리 바인딩
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    LINE_AA = cv2.LINE_AA
+    PUTTEXT = cv2.putText
+    LEFT_HIP = mp_pose.PoseLandmark.LEFT_HIP.value
+    RIGHT_HIP = mp_pose.PoseLandmark.RIGHT_HIP.value
+    LEFT_HEEL = mp_pose.PoseLandmark.LEFT_HEEL.value
+    RIGHT_HEEL = mp_pose.PoseLandmark.RIGHT_HEEL.value
+    reps_x = int(frame_width * 0.3)
+    phase_x = int(frame_width * 0.5)
+    grade_x = int(frame_width * 0.7)
+
+    # 파이프라인 단계별 실행기 (카메라 읽기 / MediaPipe 추론은 각각 전용 스레드 하나에서 실행)
+    io_executor = ThreadPoolExecutor(max_workers=1)
+    cpu_executor = ThreadPoolExecutor(max_workers=1)
+
+    async def capture(q_cap: asyncio.Queue, stop_event: asyncio.Event):
+        """카메라에서 프레임을 읽어 추론 단계로 전달하는 코루틴"""
+        loop = asyncio.get_running_loop()
+        while cap.isOpened() and not stop_event.is_set():
+            try:
+                ret, frame = await loop.run_in_executor(io_executor, cap.read)
+                if not ret:
+                    print("프레임을 읽을 수 없습니다.")
+                    break
 
-            # 좌우반전 제거 - GUI에서 한 번만 반전하도록
-            # frame = cv2.flip(frame, 1)  # 주석 처리
+                # 좌우반전 제거 - GUI에서 한 번만 반전하도록
+                # frame = cv2.flip(frame, 1)  # 주석 처리
 
-            # 현재 시간 계산
-            current_time = time.time()
-            elapsed_time = current_time - start_time
-            remaining_time = max(0, recording_duration - elapsed_time)
+                # 현재 시간 계산
+                elapsed_time = time.time() - start_time
+                remaining_time = max(0, recording_duration - elapsed_time)
 
-            # 시간 경과 시 종료
-            if elapsed_time >= recording_duration:
-                print(f"설정된 시간 {duration_seconds}초가 경과했습니다.")
+                # 시간 경과 시 종료
+                if elapsed_time >= recording_duration:
+                    print(f"설정된 시간 {duration_seconds}초가 경과했습니다.")
+                    break
+
+                await q_cap.put((frame, remaining_time))
+
+            except Exception as e:
+                print(f"메인 루프 오류: {str(e)}")
                 break
 
+        # 정상 종료 시 다음 단계에 종료 신호 전달 (취소된 경우에는 전달하지 않음)
+        await q_cap.put(None)
+
+    # MediaPipe 입력용 축소/RGB 버퍼 (첫 프레임에서 한 번만 할당)
+    infer_src_shape = None
+    infer_size = None
+    infer_buf = None
+    rgb_buf = None
+
+    def process_pose(frame: np.ndarray):
+        """프레임을 축소/색변환한 뒤 MediaPipe로 포즈를 추론"""
+        nonlocal infer_src_shape, infer_size, infer_buf, rgb_buf
+
+        if infer_src_shape != frame.shape:
+            src_h, src_w = frame.shape[:2]
+            infer_w = min(INFER_WIDTH, src_w)
+            infer_h = max(1, int(round(infer_w * src_h / src_w)))
+            infer_src_shape = frame.shape
+            infer_size = (infer_w, infer_h)
+            infer_buf = np.empty((infer_h, infer_w, 3), dtype=np.uint8)
+            rgb_buf = np.empty_like(infer_buf)
+
+        if USE_UMAT:
+            # OpenCL로 축소/색변환 후 MediaPipe 입력으로 한 번만 다운로드
+            umat = cv2.UMat(frame)
+            if infer_size[0] < frame.shape[1]:
+                umat = cv2.resize(umat, infer_size, interpolation=cv2.INTER_AREA)
+            rgb_input = cv2.cvtColor(umat, cv2.COLOR_BGR2RGB).get()
+        else:
+            rgb_buf.flags.writeable = True
+            if infer_size[0] < frame.shape[1]:
+                cv2.resize(frame, infer_size, dst=infer_buf, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(infer_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+            else:
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+            rgb_input = rgb_buf
+        rgb_input.flags.writeable = False
+        return pose.process(rgb_input)
+
+    async def infer(q_cap: asyncio.Queue, q_out: asyncio.Queue):
+        """캡처된 프레임에 대해 포즈 추론을 수행하고 분석 단계로 전달하는 코루틴"""
+        loop = asyncio.get_running_loop()
+        frame_idx = 0
+        last_results = None
+        while True:
+            item = await q_cap.get()
+            if item is None:
+                break
+            frame, remaining_time = item
             try:
-                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                image.flags.writeable = False
-                results = pose.process(image)
-                image.flags.writeable = True
-                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+                # 추론은 INFER_EVERY 프레임마다 수행하고, 나머지 프레임은 직전 결과 재사용
+                if last_results is None or frame_idx % INFER_EVERY == 0:
+                    last_results = await loop.run_in_executor(cpu_executor, process_pose, frame)
+                results = last_results
+                frame_idx += 1
             except Exception as e:
                 print(f"이미지 처리 오류: {str(e)}")
                 continue
 
-        except Exception as e:
-            print(f"메인 루프 오류: {str(e)}")
-            break
-
-        # 포즈 랜드마크가 감지되지 않은 경우 건너뛰기
-        if not results.pose_landmarks:
-            # 랜드마크가 없어도 기본 UI는 표시
-            cv2.rectangle(image, (0, 0), (frame_width, 120), (245, 117, 16), -1)
-            cv2.putText(image, f'TIME: {remaining_time:.1f}s', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
-                        (255, 255, 255), 2, cv2.LINE_AA)
-            cv2.putText(image, 'No Person Detected', (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2, cv2.LINE_AA)
-            
-            # GUI로 프레임 전달
-            if frame_callback:
-                frame_callback(image.copy())
-            
-            out.write(image)
-            continue
+            # 원본 BGR 프레임에 바로 그림 (RGB→BGR 역변환 불필요)
+            await q_out.put((frame, results, remaining_time))
 
-        try:
-            landmarks = results.pose_landmarks.landmark
-            h, w, _ = image.shape
-
-            lm_data = {
-                'left_shoulder': [landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x * w,
-                                  landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y * h],
-                'left_hip': [landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x * w,
-                             landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y * h],
-                'left_knee': [landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].x * w,
-                              landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].y * h],
-                'left_ankle': [landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].x * w,
-                               landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y * h],
-                'left_foot_index': [landmarks[mp_pose.PoseLandmark.LEFT_FOOT_INDEX.value].x * w,
-                                    landmarks[mp_pose.PoseLandmark.LEFT_FOOT_INDEX.value].y * h],
-                'right_shoulder': [landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].x * w,
-                                   landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].y * h],
-                'right_hip': [landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].x * w,
-                              landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].y * h],
-                'right_knee': [landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value].x * w,
-                               landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value].y * h],
-                'right_ankle': [landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].x * w,
-                                landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].y * h],
-                'right_foot_index': [landmarks[mp_pose.PoseLandmark.RIGHT_FOOT_INDEX.value].x * w,
-                                     landmarks[mp_pose.PoseLandmark.RIGHT_FOOT_INDEX.value].y * h],
-                'left_heel_visibility': landmarks[mp_pose.PoseLandmark.LEFT_HEEL.value].visibility,
-                'right_heel_visibility': landmarks[mp_pose.PoseLandmark.RIGHT_HEEL.value].visibility,
-            }
-
-            angles = {}
-            use_left_side = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].visibility > landmarks[
-                mp_pose.PoseLandmark.RIGHT_HIP.value].visibility
-            if use_left_side:
-                angles['hip'] = calculate_angle(lm_data['left_shoulder'], lm_data['left_hip'], lm_data['left_knee'])
-                angles['knee'] = calculate_angle(lm_data['left_hip'], lm_data['left_knee'], lm_data['left_ankle'])
-                angles['ankle'] = calculate_angle(lm_data['left_knee'], lm_data['left_ankle'],
-                                                  lm_data['left_foot_index'])
-                angles['torso'] = calculate_angle(lm_data['left_hip'], lm_data['left_shoulder'],
-                                                  [lm_data['left_shoulder'][0], lm_data['left_shoulder'][1] - 1])
-            else:
-                angles['hip'] = calculate_angle(lm_data['right_shoulder'], lm_data['right_hip'], lm_data['right_knee'])
-                angles['knee'] = calculate_angle(lm_data['right_hip'], lm_data['right_knee'], lm_data['right_ankle'])
-                angles['ankle'] = calculate_angle(lm_data['right_knee'], lm_data['right_ankle'],
-                                                   lm_data['right_foot_index'])
-                angles['torso'] = calculate_angle(lm_data['right_hip'], lm_data['right_shoulder'],
-                                                   [lm_data['right_shoulder'][0], lm_data['right_shoulder'][1] - 1])
-
-            if 'knee' in angles:
-                knee_angle = angles['knee']
-
-                if knee_angle > 160:
-                    if stage == 'down':
-                        final_grade = grader.get_grade_from_errors(list(current_rep_errors))
-                        all_rep_results.append(
-                            {'rep': counter, 'grade': final_grade, 'errors': list(current_rep_errors)})
-                        last_rep_grade = final_grade
-
-                        # 스쿼트 완료 시 격려 메시지
-                        if counter > 0:
-                            tts_manager.add_encouragement(counter)
-
-                        current_rep_errors.clear()
-                    stage = "up"
-
-                if knee_angle < 100 and stage == 'up':
-                    stage = "down"
-                    counter += 1
-                    rep_start_hip_y = (lm_data['left_hip'][1] + lm_data['right_hip'][1]) / 2
-
-                current_phase = ""
-                if stage == "up":
-                    current_phase = "ASCEND" if knee_angle < 170 else "READY"
-                elif stage == "down":
-                    current_phase = "BOTTOM" if knee_angle < 90 else "DESCEND"
-
-                if stage == "down" or stage == "up":
-                    errors_in_frame = grader.evaluate_errors(lm_data, angles, current_phase, rep_start_hip_y)
-
-                    # 현재 등급 계산하여 TTS 매니저에 전달
-                    current_grade = grader.get_grade_from_errors(list(current_rep_errors))
-                    tts_manager.current_grade = current_grade
-                    tts_manager.current_rep_errors = current_rep_errors
-
-                    # 새로운 오류에 대해서만 TTS 피드백 제공
-                    for error in errors_in_frame:
-                        if error not in current_rep_errors:
-                            priority = grader.get_error_priority(error)
-                            tts_manager.add_feedback(error, priority)
-
-                    current_rep_errors.update(errors_in_frame)
+        await q_out.put(None)
 
-        except Exception as e:
-            pass
-
-        # ------------------ 화면 표시 정보 수정 ------------------
-        # 스켈레톤 그리기 (포즈 랜드마크가 있을 때만)
-        if results.pose_landmarks:
-            mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_pose.POSE_CONNECTIONS,
-                                      mp_drawing.DrawingSpec(color=(245, 117, 66), thickness=2, circle_radius=2),
-                                      mp_drawing.DrawingSpec(color=(245, 66, 230), thickness=2, circle_radius=2))
-
-        # 상단 정보 박스
-        cv2.rectangle(image, (0, 0), (frame_width, 120), (245, 117, 16), -1)
-
-        # 타이머 표시
-        cv2.putText(image, f'TIME: {remaining_time:.1f}s', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
-                    (255, 255, 255), 2, cv2.LINE_AA)
-
-        # REPS
-        cv2.putText(image, 'REPS', (int(frame_width * 0.3), 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255),
-                    2, cv2.LINE_AA)
-        cv2.putText(image, str(counter), (int(frame_width * 0.3), 65), cv2.FONT_HERSHEY_SIMPLEX, 1.5,
-                    (255, 255, 255), 3, cv2.LINE_AA)
-
-        # PHASE
-        cv2.putText(image, 'PHASE', (int(frame_width * 0.5), 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255),
-                    2, cv2.LINE_AA)
-        cv2.putText(image, current_phase if 'current_phase' in locals() else "READY",
-                    (int(frame_width * 0.5), 65), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3,
-                    cv2.LINE_AA)
-
-        # LAST REP GRADE
-        cv2.putText(image, 'GRADE', (int(frame_width * 0.7), 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8,
-                    (255, 255, 255), 2, cv2.LINE_AA)
-        cv2.putText(image, last_rep_grade, (int(frame_width * 0.7), 65), cv2.FONT_HERSHEY_SIMPLEX, 1.5,
-                    (255, 255, 255), 3, cv2.LINE_AA)
-
-        # TTS 상태 표시
-        cv2.putText(image, 'TTS: ON', (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2, cv2.LINE_AA)
-
-        # 하단 안내 메시지
-        cv2.rectangle(image, (0, frame_height - 50), (frame_width, frame_height), (0, 0, 0), -1)
-        cv2.putText(image, 'Press Q to quit early | TTS Feedback Active', (10, frame_height - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2, cv2.LINE_AA)
-        # ----------------------------------------------------
-
-        # GUI로 처리된 프레임 전달 (저장되는 영상과 동일)
-        if frame_callback:
-            frame_callback(image.copy())  # image는 처리된 프레임 (BGR 형식)
-
-        # 동영상 저장
-        out.write(image)
-
-        # macOS에서는 GUI 없이 콘솔 모드로 실행
-        print(
-            f"프레임 처리 중... REP: {counter}, PHASE: {current_phase if 'current_phase' in locals() else 'READY'}, GRADE: {last_rep_grade}")
-
-        # 플랫폼별 OpenCV 창 표시
-        import platform
-        system = platform.system()
+    async def analyze(q_out: asyncio.Queue):
+        """채점, 화면 표시, 저장, 중지 체크를 수행하는 코루틴"""
+        nonlocal counter, stage, last_rep_grade, rep_start_hip_y, current_phase
+        nonlocal use_left_side, side_switch_count, next_status_time
+        nonlocal errors_changed, current_grade
+        nonlocal ui_top, ui_top_idle, ui_bottom, reps_x, phase_x, grade_x
 
-        # 젯슨 감지 (ARM64 + Linux)
-        is_jetson = False
-        if system == "Linux":
-            try:
-                with open('/proc/cpuinfo', 'r') as f:
-                    cpu_info = f.read()
-                    if 'aarch64' in cpu_info or 'ARM' in cpu_info:
-                        is_jetson = True
-            except:
-                pass
+        while True:
+            item = await q_out.get()
+            if item is None:
+                break
+            image, results, remaining_time = item
+
+            # 분석 중지 체크 (전역 플래그 또는 콜백 함수로 제어) - 사람 미검출 프레임 포함 매 프레임 1회
+            if run_squat_analysis._stop_analysis or (stop_callback and stop_callback()):
+                print("분석이 중지되었습니다.")
+                break
+
+            # 드라이버가 보고한 크기와 실제 프레임 너비가 다르면 오버레이 템플릿을 실제 크기로 다시 만듦
+            # (높이는 하단 박스를 프레임 끝 기준으로 붙이므로 상관없음)
+            frame_w = image.shape[1]
+            if frame_w != ui_top.shape[1]:
+                ui_top, ui_top_idle, ui_bottom = build_overlay_templates(frame_w, image.shape[0])
+                reps_x = int(frame_w * 0.3)
+                phase_x = int(frame_w * 0.5)
+                grade_x = int(frame_w * 0.7)
+
+            # 포즈 랜드마크가 감지되지 않은 경우 건너뛰기
+            if not results.pose_landmarks:
+                # 랜드마크가 없어도 기본 UI는 표시 (미리 그려둔 상단 박스 복사 후 시간만 표시)
+                image[:ui_top_idle.shape[0]] = ui_top_idle
+                PUTTEXT(image, f'TIME: {remaining_time:.1f}s', (10, 30), FONT, 0.8, (255, 255, 255), 2, LINE_AA)
+            
+                # GUI로 프레임 전달
+                if frame_callback:
+                    frame_callback(image)
+            
+                out.write(image)
+                continue
 
-        # 젯슨에서만 스켈레톤 표시
-        if is_jetson:
             try:
-                cv2.namedWindow('Real-time Squat Analysis with TTS', cv2.WINDOW_NORMAL)
-                cv2.resizeWindow('Real-time Squat Analysis with TTS', 1280, 720)
-                cv2.imshow('Real-time Squat Analysis with TTS', image)
-
-                # 젯슨에서는 키 입력도 처리
-                key = cv2.waitKey(10) & 0xFF
-                if key == ord('q'):
-                    print("사용자가 'q'를 눌러 분석을 중단했습니다.")
-                    break
-                elif key == ord('s'):  # 's' 키로 스크린샷 저장
-                    screenshot_path = os.path.join(output_dir, f"screenshot_{timestamp}_{int(time.time())}.jpg")
-                    cv2.imwrite(screenshot_path, image)
-                    print(f"스크린샷 저장: {screenshot_path}")
+                landmarks = results.pose_landmarks.landmark
+                h, w, _ = image.shape
+
+                for i, lm_id in enumerate(ANGLE_LANDMARK_IDS):
+                    pts[i, 0] = landmarks[lm_id].x * w
+                    pts[i, 1] = landmarks[lm_id].y * h
+
+                lm_data = dict(zip(ANGLE_LANDMARK_KEYS, pts.tolist()))
+                lm_data['left_heel_visibility'] = landmarks[LEFT_HEEL].visibility
+                lm_data['right_heel_visibility'] = landmarks[RIGHT_HEEL].visibility
+
+                # 측정 측면 선택 - 가시성이 뚜렷하게 역전된 상태가 연속으로 유지될 때만 전환
+                vis_diff = landmarks[LEFT_HIP].visibility - landmarks[RIGHT_HIP].visibility
+                if use_left_side is None:
+                    use_left_side = vis_diff > 0
+                elif abs(vis_diff) > SIDE_SWITCH_MARGIN and (vis_diff > 0) != use_left_side:
+                    side_switch_count += 1
+                    if side_switch_count >= SIDE_SWITCH_FRAMES:
+                        use_left_side = not use_left_side
+                        side_switch_count = 0
+                else:
+                    side_switch_count = 0
+
+                side = 0 if use_left_side else 5
+                quantized_pts = tuple((pts[side:side + 5] * ANGLE_CACHE_SCALE).astype(np.int32).ravel().tolist())
+                hip, knee, ankle, torso = compute_angles_cached(quantized_pts)
+                angles = {'hip': hip, 'knee': knee, 'ankle': ankle, 'torso': torso}
+
+                if 'knee' in angles:
+                    knee_angle = angles['knee']
+
+                    if knee_angle > 160:
+                        if stage == 'down':
+                            rep_errors = tuple(current_rep_errors)
+                            final_grade = grader.get_grade_from_errors(rep_errors)
+                            all_rep_results.append(RepResult(counter, final_grade, rep_errors))
+                            last_rep_grade = final_grade
+
+                            # 스쿼트 완료 시 격려 메시지
+                            if counter > 0:
+                                tts_manager.add_encouragement(counter)
+
+                            current_rep_errors.clear()
+                            errors_changed = True
+                        stage = "up"
+
+                    if knee_angle < 100 and stage == 'up':
+                        stage = "down"
+                        counter += 1
+                        rep_start_hip_y = (lm_data['left_hip'][1] + lm_data['right_hip'][1]) / 2
+
+                    current_phase = ""
+                    if stage == "up":
+                        current_phase = "ASCEND" if knee_angle < 170 else "READY"
+                    elif stage == "down":
+                        current_phase = "BOTTOM" if knee_angle < 90 else "DESCEND"
+
+                    if stage == "down" or stage == "up":
+                        errors_in_frame = grader.evaluate_errors(lm_data, angles, current_phase, rep_start_hip_y)
+
+                        # 현재 등급 계산하여 TTS 매니저에 전달 (오류 집합이 바뀐 경우에만 재계산)
+                        if errors_changed:
+                            current_grade = grader.get_grade_from_errors(current_rep_errors)
+                            errors_changed = False
+                        tts_manager.current_grade = current_grade
+                        tts_manager.current_rep_errors = current_rep_errors
+
+                        # 새로운 오류에 대해서만 TTS 피드백 제공
+                        for error in errors_in_frame:
+                            if error not in current_rep_errors:
+                                priority = grader.get_error_priority(error)
+                                tts_manager.add_feedback(error, priority)
+
+                        num_errors = len(current_rep_errors)
+                        current_rep_errors.update(errors_in_frame)
+                        if len(current_rep_errors) != num_errors:
+                            errors_changed = True
 
             except Exception as e:
-                print(f"젯슨 OpenCV 창 오류: {e}")
-        else:
-            # macOS 등에서는 GUI 없이 실행
-            time.sleep(0.01)  # 10ms 대기
+                pass
+
+            # ------------------ 화면 표시 정보 수정 ------------------
+            # 스켈레톤 그리기 (포즈 랜드마크가 있고 표시가 켜져 있을 때만)
+            if draw_skeleton and results.pose_landmarks:
+                mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_pose.POSE_CONNECTIONS,
+                                          LANDMARK_DRAWING_SPEC, CONNECTION_DRAWING_SPEC)
+
+            # 상단 정보 박스 / 하단 안내 메시지 (고정 라벨은 미리 그려둔 템플릿 복사)
+            image[:ui_top.shape[0]] = ui_top
+            image[-ui_bottom.shape[0]:] = ui_bottom
 
-        # 시간 기반 종료 조건 (예: 5초마다 상태 출력)
-        if int(time.time()) % 5 == 0 and int(time.time()) != getattr(locals(), '_last_status_time', 0):
-            print(f"스쿼트 분석 진행 중... 시간: {remaining_time:.1f}초, 반복: {counter}")
-            _last_status_time = int(time.time())
+            # 타이머 표시
+            PUTTEXT(image, f'TIME: {remaining_time:.1f}s', (10, 30), FONT, 0.8, (255, 255, 255), 2, LINE_AA)
 
-        # 분석 중지 체크 (전역 변수로 제어)
-        if hasattr(run_squat_analysis, '_stop_analysis') and run_squat_analysis._stop_analysis:
-            print("분석이 중지되었습니다.")
-            break
+            # REPS
+            PUTTEXT(image, str(counter), (reps_x, 65), FONT, 1.5, (255, 255, 255), 3, LINE_AA)
 
-        # 분석 중지 체크 (콜백 함수로 제어)
-        if stop_callback and stop_callback():
-            print("분석이 중지되었습니다.")
-            break
+            # PHASE
+            PUTTEXT(image, current_phase, (phase_x, 65), FONT, 1.5, (255, 255, 255), 3, LINE_AA)
 
-        # 더 자주 중지 체크 (매 10프레임마다)
-        if counter % 10 == 0 and stop_callback and stop_callback():
-            print("분석이 중지되었습니다.")
-            break
+            # LAST REP GRADE
+            PUTTEXT(image, last_rep_grade, (grade_x, 65), FONT, 1.5, (255, 255, 255), 3, LINE_AA)
+            # ----------------------------------------------------
+
+            # GUI로 처리된 프레임 전달 (저장되는 영상과 동일)
+            if frame_callback:
+                frame_callback(image)  # image는 처리된 프레임 (BGR 형식)
+
+            # 동영상 저장
+            out.write(image)
+
+            # macOS에서는 GUI 없이 콘솔 모드로 실행
+            print(
+                f"프레임 처리 중... REP: {counter}, PHASE: {current_phase}, GRADE: {last_rep_grade}")
+
+            # 젯슨에서만 스켈레톤 표시 (플랫폼별 OpenCV 창 표시)
+            if IS_JETSON:
+                try:
+                    cv2.namedWindow('Real-time Squat Analysis with TTS', cv2.WINDOW_NORMAL)
+                    cv2.resizeWindow('Real-time Squat Analysis with TTS', 1280, 720)
+                    cv2.imshow('Real-time Squat Analysis with TTS', image)
+
+                    # 젯슨에서는 키 입력도 처리
+                    key = cv2.waitKey(10) & 0xFF
+                    if key == ord('q'):
+                        print("사용자가 'q'를 눌러 분석을 중단했습니다.")
+                        break
+                    elif key == ord('s'):  # 's' 키로 스크린샷 저장
+                        screenshot_path = os.path.join(output_dir, f"screenshot_{timestamp}_{int(time.time())}.jpg")
+                        cv2.imwrite(screenshot_path, image)
+                        print(f"스크린샷 저장: {screenshot_path}")
+
+                except Exception as e:
+                    print(f"젯슨 OpenCV 창 오류: {e}")
+
+            # 5초마다 상태 출력
+            now = time.monotonic()
+            if now >= next_status_time:
+                print(f"스쿼트 분석 진행 중... 시간: {remaining_time:.1f}초, 반복: {counter}")
+                next_status_time = now + 5.0
+
+    async def run_pipeline():
+        """캡처 → 추론 → 분석 단계를 크기 제한 큐로 연결해 실행"""
+        stop_event = asyncio.Event()
+        q_cap = asyncio.Queue(maxsize=2)
+        q_out = asyncio.Queue(maxsize=2)
+        producers = [asyncio.ensure_future(capture(q_cap, stop_event)),
+                     asyncio.ensure_future(infer(q_cap, q_out))]
+        try:
+            await analyze(q_out)
+        finally:
+            stop_event.set()
+            for task in producers:
+                task.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+
+    try:
+        asyncio.run(run_pipeline())
+    finally:
+        io_executor.shutdown(wait=True)
+        cpu_executor.shutdown(wait=True)
 
     # 마지막 스쿼트가 완료되지 않았다면 처리
     if stage == 'down' and current_rep_errors:
-        final_grade = grader.get_grade_from_errors(list(current_rep_errors))
-        all_rep_results.append({'rep': counter, 'grade': final_grade, 'errors': list(current_rep_errors)})
+        rep_errors = tuple(current_rep_errors)
+        final_grade = grader.get_grade_from_errors(rep_errors)
+        all_rep_results.append(RepResult(counter, final_grade, rep_errors))
 
     # TTS 매니저 정리
     tts_manager.stop()
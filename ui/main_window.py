@@ -8,6 +8,12 @@ import sys
 import os
 import time
 import threading
+import traceback
+import importlib
+import queue
+import functools
+from collections import deque
+from dataclasses import dataclass, field
 
 # macOS Segmentation fault 방지를 위한 환경변수 설정
 os.environ['OPENCV_VIDEOIO_PRIORITY_MSMF'] = '0'
@@ -17,210 +23,394 @@ os.environ['QT_MAC_WANTS_LAYER'] = '1'
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QGroupBox,
                              QSpinBox, QTextEdit, QMessageBox, QFrame)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer, QMutex
+from PyQt5.QtCore import (QThread, QRunnable, QThreadPool, pyqtSignal, pyqtSlot, Qt, QTimer,
+                          QEvent)
 from PyQt5.QtGui import QPixmap, QImage, QFont
 import cv2
 import numpy as np
 
+# OpenCV 스레드 수: GUI 스레드와 분석(추론) 스레드용으로 코어 2개를 남겨 둠
+# (Jetson Nano 4코어 -> 2, Orin NX 8코어 -> 6)
+OPENCV_NUM_THREADS = max(1, (os.cpu_count() or 4) - 2)
+
 # OpenCV 백엔드 설정 (macOS 안정성 향상)
 try:
     cv2.setUseOptimized(True)
-    cv2.setNumThreads(4)
+    cv2.setNumThreads(OPENCV_NUM_THREADS)
 except:
     pass
 
-class ExerciseAnalyzerThread(QThread):
-    """운동 분석을 위한 스레드 - macOS 안정성 강화"""
-    analysis_finished = pyqtSignal(str, str)
+# 카메라 미리보기 표시 FPS (카메라는 30 FPS로 받되 디코딩/표시는 이 빈도로만 수행)
+CAMERA_PREVIEW_FPS = 15
+# 드라이버 큐에 쌓인 프레임 비우기: 이보다 빨리 반환된 grab()은 이미 쌓여 있던(오래된) 프레임으로 간주
+CAMERA_STALE_GRAB_SECONDS = 0.005
+CAMERA_MAX_STALE_FRAMES = 4
+# 이전 카메라 스레드가 아직 종료 중이면 이 간격(ms)으로 카메라 재시작을 다시 시도
+CAMERA_RESTART_RETRY_MS = 200
+# GUI가 최신 프레임을 가져가는 주기 (ms)
+FRAME_DRAIN_INTERVAL_MS = 30
+# 분석 상태 메시지는 이 주기로 모아서 마지막 메시지만 표시 (최대 10Hz)
+STATUS_UPDATE_INTERVAL_MS = 100
+
+# 미리보기 QImage 포맷: Qt 5.14+는 BGR을 그대로 표시, 그 이전 버전은 버퍼에서 RGB로 제자리 변환
+PREVIEW_IMAGE_FORMAT = getattr(QImage, 'Format_BGR888', None)
+PREVIEW_NEEDS_RGB_SWAP = PREVIEW_IMAGE_FORMAT is None
+if PREVIEW_NEEDS_RGB_SWAP:
+    PREVIEW_IMAGE_FORMAT = QImage.Format_RGB888
+
+# 결과 창에 표시할 리포트 최대 크기 (이보다 크면 마지막 부분만 표시)
+REPORT_MAX_BYTES = 256 * 1024
+
+class PreviewFrameQueue:
+    """producer 스레드(카메라/분석) -> GUI 최신 프레임 전달
+
+    좌우반전과 라벨 크기로의 축소를 producer 스레드에서 OpenCV(SIMD)로 처리하고,
+    결과는 돌려 쓰는 버퍼 3개 중 하나에 기록한 뒤 deque(maxlen=1)에 최신 버퍼 번호만 남긴다.
+    producer는 최신 프레임 버퍼와 GUI가 표시 중인 버퍼를 피해 나머지 하나에 쓰므로,
+    GUI 속도보다 빨리 넣더라도 그리는 중인 프레임이 덮어써지지 않는다.
+    각 버퍼에는 같은 메모리를 가리키는 QImage를 한 번만 만들어 두므로(버퍼와 수명이 같음)
+    GUI는 pop()으로 QImage를 받아 복사/스케일링 없이 바로 표시한다.
+    """
+
+    def __init__(self):
+        self._frames = deque(maxlen=1)
+        self._scaled = None  # 축소 결과 (좌우반전 전)
+        # 버퍼별 (QImage, 좌우반전 결과 ndarray) 쌍 - 한 번에 대입/조회해 서로 다른 버퍼와 섞이지 않게 함
+        self._slots = [None, None, None]
+        self._latest = None  # 마지막으로 put한 버퍼 번호
+        self._displaying = None  # GUI가 마지막으로 pop한(표시 중인) 버퍼 번호
+        self._lock = threading.Lock()  # 쓸 버퍼 선택과 pop이 엇갈리지 않도록 보호
+        self.target_size = None  # (너비, 높이) - GUI가 라벨 크기 변경 시 갱신
+        self._consumed = threading.Event()  # GUI가 마지막 프레임을 다 그렸으면 set
+        self._consumed.set()
+
+    def put(self, frame):
+        """프레임을 표시 크기로 축소/좌우반전하여 최신 프레임으로 등록 (입력 버퍼는 바로 재사용 가능)"""
+        h, w = frame.shape[:2]
+        target = self.target_size
+        if target:
+            scale = min(target[0] / w, target[1] / h)
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            if size != (w, h):
+                if self._scaled is None or self._scaled.shape[1::-1] != size:
+                    self._scaled = None  # 크기가 바뀌면 새로 할당
+                # 축소는 INTER_AREA(모아레 없음), 확대는 INTER_LINEAR
+                interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+                self._scaled = cv2.resize(frame, size, dst=self._scaled, interpolation=interpolation)
+                frame = self._scaled
+
+        with self._lock:
+            index = next(i for i in range(len(self._slots)) if i != self._latest and i != self._displaying)
+        slot = self._slots[index]
+        if slot is None or slot[1].shape != frame.shape:
+            # 크기가 바뀔 때만 버퍼와 QImage를 새로 만듦
+            fh, fw, ch = frame.shape
+            buf = np.empty((fh, fw, ch), dtype=np.uint8)
+            self._slots[index] = (QImage(buf.data, fw, fh, buf.strides[0], PREVIEW_IMAGE_FORMAT), buf)
+        else:
+            buf = slot[1]
+        # flip 결과는 풀 버퍼에 기록되므로 producer의 원본 버퍼와 분리됨
+        cv2.flip(frame, 1, dst=buf)
+        if PREVIEW_NEEDS_RGB_SWAP:
+            # Qt < 5.14: producer 스레드에서 풀 버퍼를 제자리 변환 (GUI에서 rgbSwapped()로 매 프레임 새 QImage를 만들지 않음)
+            cv2.cvtColor(buf, cv2.COLOR_BGR2RGB, dst=buf)
+        with self._lock:
+            self._latest = index
+            self._consumed.clear()
+            self._frames.append(index)
+
+    def wait_consumed(self, timeout):
+        """GUI가 마지막으로 넣은 프레임을 그릴 때까지 최대 timeout(초) 대기 - producer 속도 조절용"""
+        return self._consumed.wait(timeout)
+
+    def mark_consumed(self):
+        """GUI가 프레임 표시를 마쳤음을 알림"""
+        self._consumed.set()
+
+    def pop(self):
+        """최신 프레임의 (QImage, 실제 메모리 버퍼) 반환 (없으면 IndexError)
+
+        QImage는 버퍼 메모리를 소유하지 않으므로, 표시하는 동안 producer가 크기 변경으로
+        버퍼를 교체하더라도 메모리가 해제되지 않도록 버퍼 참조를 함께 넘긴다.
+        """
+        with self._lock:
+            index = self._frames.pop()
+            self._displaying = index
+        return self._slots[index]
+
+    def clear(self):
+        self._frames.clear()
+
+def read_report_text(report_path, max_bytes=REPORT_MAX_BYTES):
+    """리포트 파일을 읽어 문자열로 반환 (max_bytes보다 크면 마지막 max_bytes만 읽음)"""
+    size = os.path.getsize(report_path)
+    with open(report_path, 'rb') as f:
+        if size <= max_bytes:
+            return f.read().decode('utf-8', errors='replace')
+        f.seek(size - max_bytes)
+        # 잘린 위치의 깨진 UTF-8 문자는 버림
+        tail = f.read().decode('utf-8', errors='ignore')
+    return f"... (리포트가 커서 앞부분 {size - max_bytes} 바이트는 생략되었습니다)\n" + tail
+
+# 운동 타입별 분석 모듈 이름
+ANALYZER_MODULE_NAMES = {
+    "squat": "squat_real_tts",
+    "lunge": "lunge_realtime",
+    "plank": "plank",
+}
+
+# 운동 타입별 표시 이름 (상태/오류 메시지용)
+EXERCISE_DISPLAY_NAMES = {
+    "squat": "스쿼트",
+    "lunge": "런지",
+    "plank": "플랭크",
+}
+
+# 분석 모듈별 미리 불러오기 완료 여부 (모듈 이름 -> Event, 성공/실패와 관계없이 끝나면 set)
+# GUI 스레드에서만 추가하고, 워커 스레드는 읽기만 함
+_preload_events = {}
+
+class AnalyzerPreloadRunnable(QRunnable):
+    """선택한 운동의 분석 모듈(mediapipe 등 무거운 의존성 포함)만 백그라운드에서 미리 import"""
+
+    def __init__(self, module_name, done_event):
+        super().__init__()
+        self.module_name = module_name
+        self.done_event = done_event
+
+    def run(self):
+        try:
+            importlib.import_module(self.module_name)
+            print(f"[DEBUG] 분석 모듈 미리 불러오기 완료: {self.module_name}")
+        except Exception as e:
+            # 실패해도 분석 시작 시 다시 import하면서 오류를 보고함
+            print(f"[WARNING] 분석 모듈 미리 불러오기 실패 ({self.module_name}): {e}")
+        finally:
+            self.done_event.set()
+
+def is_module_preloading(module_name):
+    """해당 분석 모듈을 아직 미리 불러오는 중이면 True"""
+    event = _preload_events.get(module_name)
+    return event is not None and not event.is_set()
+
+@dataclass
+class AnalysisJob:
+    """분석 워커에 넣는 작업 하나"""
+    exercise_type: str
+    duration_seconds: int
+    stop_event: threading.Event = field(default_factory=threading.Event)  # 이 작업의 중지 요청
+
+class AnalyzerWorker(QThread):
+    """운동 분석 상주 워커 스레드 (macOS 안정성 강화)
+
+    앱 시작 시 한 번만 만들어 두고 명령 큐로 분석 작업을 받는다.
+    분석할 때마다 스레드를 새로 만들지 않고, 불러온 분석 모듈(모델 포함)도 계속 재사용한다.
+    """
+    analysis_finished = pyqtSignal(str, str, str)  # (비디오 경로, 리포트 경로, 리포트 내용)
     error_occurred = pyqtSignal(str)
     status_updated = pyqtSignal(str)
-    frame_processed = pyqtSignal(np.ndarray)  # 처리된 프레임을 GUI로 전달
 
-    def __init__(self, exercise_type, duration_seconds):
+    # 한 번 불러온 분석 모듈 캐시 (모듈 이름 -> 모듈), 분석할 때마다 reload하지 않음
+    _MODULES = {}
+
+    def __init__(self, frame_queue):
         super().__init__()
-        self.exercise_type = exercise_type
-        self.duration_seconds = duration_seconds
-        self.running = True
-        self.mutex = QMutex()
+        self.frame_queue = frame_queue  # 처리된 프레임을 GUI로 전달 (PreviewFrameQueue, 최신 1장만 유지)
+        self.commands = queue.Queue()  # AnalysisJob 또는 종료 신호 None
+        self.exercise_type = None
+        self.duration_seconds = 0
+        self._stop_event = threading.Event()  # 현재 작업의 중지 요청 여부 (락 없이 원자적으로 확인)
+        self._job_stops = set()  # 큐에 있거나 실행 중인 모든 작업의 중지 이벤트
+        self._pending = 0  # 큐에 있거나 실행 중인 작업 수
+        self._pending_lock = threading.Lock()
+        self._idle = threading.Event()  # 처리할 작업이 없으면 set
+        self._idle.set()
+
+    def submit(self, job):
+        """분석 작업(AnalysisJob)을 큐에 추가"""
+        with self._pending_lock:
+            self._pending += 1
+            self._idle.clear()
+            self._job_stops.add(job.stop_event)
+        self.commands.put(job)
+
+    def is_busy(self):
+        """대기 중이거나 실행 중인 작업이 있으면 True"""
+        return not self._idle.is_set()
 
     def run(self):
+        """명령 큐에서 작업을 꺼내 순서대로 실행 (None을 받으면 종료)"""
+        while True:
+            job = self.commands.get()
+            if job is None:
+                break
+            self.exercise_type = job.exercise_type
+            self.duration_seconds = job.duration_seconds
+            self._stop_event = job.stop_event
+            try:
+                # 시작 전에 중지된 작업은 카메라를 열지 않고 건너뜀
+                if not self._stop_event.is_set():
+                    self._run_job()
+            finally:
+                # 작업별 상태는 다음 작업까지 들고 있지 않음 (끝난 작업의 객체가 계속 참조되지 않도록)
+                self.exercise_type = None
+                self.duration_seconds = 0
+                job = None
+                with self._pending_lock:
+                    self._job_stops.discard(self._stop_event)
+                    self._pending -= 1
+                    if self._pending == 0:
+                        self._idle.set()
+        print("[DEBUG] 분석 워커 종료")
+
+    @classmethod
+    def _load_module(cls, module_name):
+        """분석 모듈을 처음 한 번만 import하고 이후에는 캐시된 모듈 반환"""
+        module = cls._MODULES.get(module_name)
+        if module is None:
+            module = importlib.import_module(module_name)
+            cls._MODULES[module_name] = module
+        return module
+
+    def _run_job(self):
         """안전한 분석 실행"""
         try:
-            # 메모리 정리
-            import gc
-            gc.collect()
-
-            print(f"[DEBUG] 분석 스레드 시작: {self.exercise_type}")
+            print(f"[DEBUG] 분석 작업 시작: {self.exercise_type}")
             video_path, report_path = None, None
 
-            # 안전한 모듈 import 및 실행
-            if self.exercise_type == "squat":
-                self.status_updated.emit("스쿼트 분석 모듈 로드 중...")
+            # 선택한 운동의 모듈만 import (처음 한 번만, 이후에는 캐시 사용) 후 실행
+            module_name = ANALYZER_MODULE_NAMES.get(self.exercise_type)
+            if module_name is None:
+                self.error_occurred.emit("알 수 없는 운동 타입입니다.")
+                return
 
-                try:
-                    # 동적 import로 메모리 충돌 방지
-                    import importlib
-                    import sys
-
-                    # 모듈이 이미 로드되어 있다면 재로드
-                    if 'squat_real_tts' in sys.modules:
-                        squat_module = sys.modules['squat_real_tts']
-                        importlib.reload(squat_module)
-                    else:
-                        squat_module = importlib.import_module('squat_real_tts')
-
-                    self.status_updated.emit("스쿼트 분석 시작...")
-
-                    # 함수가 존재하는지 확인
-                    if hasattr(squat_module, 'run_squat_analysis'):
-                        video_path, report_path = squat_module.run_squat_analysis(
-                            self.duration_seconds, self.should_stop, self.frame_callback
-                        )
-                    else:
-                        self.error_occurred.emit("분석 함수(run_squat_analysis)를 찾을 수 없습니다.")
-                        return
-
-                except ImportError as e:
-                    self.error_occurred.emit(f"스쿼트 모듈 로드 실패: {str(e)}")
-                    return
-                except Exception as e:
-                    self.error_occurred.emit(f"스쿼트 분석 실행 오류: {str(e)}")
-                    return
+            # 미리 불러오기가 진행 중이면 끝날 때까지 대기 (모듈 로드 시간을 이중으로 쓰지 않도록)
+            preload_event = _preload_events.get(module_name)
+            if preload_event is not None and not preload_event.is_set():
+                self.status_updated.emit("분석 모듈 준비 중...")
+                preload_event.wait()
+            # 준비를 기다리는 동안 중지되었으면 카메라를 열지 않고 종료
+            if self._stop_event.is_set():
+                return
+            display_name = EXERCISE_DISPLAY_NAMES[self.exercise_type]
+            function_name = f"run_{self.exercise_type}_analysis"
 
-            elif self.exercise_type == "lunge":
-                self.status_updated.emit("런지 분석 모듈 로드 중...")
-                try:
-                    # 동적 import로 메모리 충돌 방지 (스쿼트와 동일한 방식)
-                    import importlib
-                    import sys
-
-                    if 'lunge_realtime' in sys.modules:
-                        lunge_module = sys.modules['lunge_realtime']
-                        importlib.reload(lunge_module)
-                    else:
-                        lunge_module = importlib.import_module('lunge_realtime')
-
-                    self.status_updated.emit("런지 분석 시작...")
-
-                    # 함수가 존재하는지 확인 (스쿼트와 동일한 방식)
-                    if hasattr(lunge_module, 'run_lunge_analysis'):
-                        video_path, report_path = lunge_module.run_lunge_analysis(
-                            self.duration_seconds, self.should_stop, self.frame_callback
-                        )
-                    else:
-                        self.error_occurred.emit("분석 함수(run_lunge_analysis)를 찾을 수 없습니다.")
-                        return
-
-                except ImportError as e:
-                    self.error_occurred.emit(f"런지 모듈(lunge_realtime.py) 로드 실패: {str(e)}")
-                    return
-                except Exception as e:
-                    self.error_occurred.emit(f"런지 분석 실행 오류: {str(e)}")
-                    return
+            self.status_updated.emit(f"{display_name} 분석 모듈 로드 중...")
+            try:
+                module = self._load_module(module_name)
+            except ImportError as e:
+                self.error_occurred.emit(f"{display_name} 모듈({module_name}.py) 로드 실패: {str(e)}")
+                return
+            if self._stop_event.is_set():
+                return
 
-            elif self.exercise_type == "plank":
-                self.status_updated.emit("플랭크 분석 모듈 로드 중...")
-                try:
-                    # 동적 import로 메모리 충돌 방지
-                    import importlib
-                    import sys
-
-                    if 'plank' in sys.modules:
-                        plank_module = sys.modules['plank']
-                        importlib.reload(plank_module)
-                    else:
-                        plank_module = importlib.import_module('plank')
-
-                    self.status_updated.emit("플랭크 분석 시작...")
-
-                    # plank.py에 있는 분석 함수 이름을 'run_plank_analysis'로 가정합니다.
-                    # 만약 함수 이름이 다르다면 이 부분을 수정해야 합니다.
-                    if hasattr(plank_module, 'run_plank_analysis'):
-                        video_path, report_path = plank_module.run_plank_analysis(
-                            self.duration_seconds, self.should_stop, self.frame_callback
-                        )
-                    else:
-                        self.error_occurred.emit("분석 함수(run_plank_analysis)를 찾을 수 없습니다.")
-                        return
-
-                except ImportError as e:
-                    self.error_occurred.emit(f"플랭크 모듈(plank.py) 로드 실패: {str(e)}")
-                    return
-                except Exception as e:
-                    self.error_occurred.emit(f"플랭크 분석 실행 오류: {str(e)}")
-                    return
-            else:
-                self.error_occurred.emit("알 수 없는 운동 타입입니다.")
+            # 함수가 존재하는지 확인
+            run_analysis = getattr(module, function_name, None)
+            if run_analysis is None:
+                self.error_occurred.emit(f"분석 함수({function_name})를 찾을 수 없습니다.")
+                return
+
+            self.status_updated.emit(f"{display_name} 분석 시작...")
+            try:
+                video_path, report_path = run_analysis(
+                    self.duration_seconds,
+                    stop_callback=self.should_stop,
+                    frame_callback=self.frame_callback,
+                )
+            except Exception as e:
+                self.error_occurred.emit(f"{display_name} 분석 실행 오류: {str(e)}")
                 return
 
-            if not self.running:
+            if self._stop_event.is_set():
                 print("[DEBUG] 분석이 중지되었습니다.")
                 return
 
             if video_path and report_path:
-                self.analysis_finished.emit(video_path, report_path)
+                # 리포트는 GUI 스레드가 아닌 이 워커 스레드에서 미리 읽어 함께 전달
+                self.status_updated.emit("리포트 불러오는 중...")
+                try:
+                    report_content = read_report_text(report_path)
+                except Exception as e:
+                    report_content = f"리포트 파일을 읽을 수 없습니다: {e}"
+                self.analysis_finished.emit(video_path, report_path, report_content)
             else:
                 self.error_occurred.emit("분석이 알 수 없는 이유로 실패했습니다.")
 
         except Exception as e:
-            if not self.running:
+            if self._stop_event.is_set():
                 return
-            print(f"[ERROR] 분석 스레드 오류: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            # 상세 트레이스백은 콘솔에만 남기고 GUI에는 요약 메시지만 전달
+            details = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+            print(f"[ERROR] 분석 스레드 오류: {str(e)}\n{details}")
             self.error_occurred.emit(f"분석 중 오류 발생: {str(e)}")
         finally:
-            # 메모리 정리
-            import gc
-            gc.collect()
-            print("[DEBUG] 분석 스레드 종료 및 메모리 정리")
+            print("[DEBUG] 분석 작업 종료")
 
     def frame_callback(self, processed_frame):
-        """처리된 프레임을 GUI로 전달하는 콜백 - 안전성 강화"""
+        """처리된 프레임을 GUI로 전달하는 콜백 - 안전성 강화
+
+        분석 모듈은 원본 배열을 복사 없이 넘기고 콜백이 반환된 뒤 다시 사용하므로,
+        frame_queue.put()이 반환 전에 자신의 버퍼로 축소/좌우반전해 두는 것으로 충분하다.
+        """
         try:
-            if not self.running:
+            if self._stop_event.is_set():
                 return
 
-            self.mutex.lock()
-            try:
-                if processed_frame is not None and processed_frame.size > 0:
-                    # 안전한 복사본 생성
-                    frame_copy = processed_frame.copy()
-                    # BGR을 RGB로 변환하여 전달
-                    rgb_frame = cv2.cvtColor(frame_copy, cv2.COLOR_BGR2RGB)
-                    self.frame_processed.emit(rgb_frame)
-            finally:
-                self.mutex.unlock()
+            # deque.append는 스레드 안전하므로 별도 락 불필요
+            if processed_frame is not None and processed_frame.size > 0:
+                # 축소/좌우반전은 이 스레드에서 수행 - 결과가 큐의 버퍼에 기록되므로
+                # 별도의 방어적 복사 없이도 분석 모듈의 원본과 분리됨 (BGR 그대로 전달)
+                self.frame_queue.put(processed_frame)
         except Exception as e:
             print(f"frame_callback 오류: {e}")
 
     def should_stop(self):
         """중지 여부 확인"""
-        return not self.running
-
-    def stop(self):
-        """안전한 스레드 중지"""
-        print("[DEBUG] 분석 스레드 중지 요청")
-        self.mutex.lock()
-        self.running = False
-        self.mutex.unlock()
-
-        self.quit()
-        self.wait(5000)  # 최대 5초 대기
+        return self._stop_event.is_set()
+
+    def stop(self, timeout=2.0):
+        """현재 분석 작업 중지 (플래그로 협조적 중지, 워커 스레드는 계속 대기)
+
+        분석 루프가 매 프레임 should_stop()을 확인하므로 보통 바로 끝나지만,
+        UI 스레드가 무한정 막히지 않도록 timeout(초)까지만 기다린다.
+        제시간에 종료되면 True, 아니면 False를 반환한다.
+        """
+        print("[DEBUG] 분석 작업 중지 요청")
+        # 실행 중인 작업과 큐에 남은 작업을 모두 중지 (연속 클릭으로 작업이 여러 개 들어온 경우 포함)
+        with self._pending_lock:
+            self._stop_event.set()
+            for stop_event in self._job_stops:
+                stop_event.set()
+
+        if self._idle.wait(timeout):
+            return True
+        print(f"[WARNING] 분석 작업이 {timeout}초 안에 종료되지 않았습니다. 백그라운드에서 종료를 기다립니다.")
+        return False
+
+    def shutdown(self, timeout_ms=3000):
+        """진행 중인 작업을 중지하고 워커 스레드 종료 (앱 종료 시)"""
+        self.stop(timeout=0)
+        self.commands.put(None)
+        self.wait(timeout_ms)
 
 # 이하 CameraThread, MainWindow 등 나머지 코드는 이전과 동일합니다.
 # ... (생략) ...
 # 전체 코드가 필요하시면 말씀해주세요. 여기서는 변경된 부분만 명확히 보여드립니다.
 class CameraThread(QThread):
-    """실시간 카메라 피드를 위한 스레드 (macOS 안정성 강화)"""
-    frame_ready = pyqtSignal(np.ndarray)
+    """실시간 카메라 피드를 위한 스레드 (macOS 안정성 강화)
+
+    프레임은 시그널 대신 frame_queue(PreviewFrameQueue)에 넣고 GUI 타이머가 최신 것만 가져간다.
+    """
     error_occurred = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, frame_queue, target_fps=CAMERA_PREVIEW_FPS):
         super().__init__()
-        self.running = True
+        self.frame_queue = frame_queue
+        self._stop_event = threading.Event()  # 중지 요청 여부 (락 없이 원자적으로 확인)
         self.cap = None
-        self.mutex = QMutex()  # 스레드 안전성
+        self.frame_interval = 1.0 / target_fps
+        # 디코딩용 버퍼 (첫 프레임에서만 할당, 표시용 버퍼는 frame_queue가 관리)
+        self.raw_frame = None
 
     def run(self):
         try:
@@ -236,6 +426,9 @@ class CameraThread(QThread):
 
             # 안전한 카메라 설정
             try:
+                # MJPG 요청: USB 카메라의 YUYV보다 640x480@30 대역폭 여유가 있고 드라이버 쪽 처리량이 높음
+                # (해상도보다 먼저 설정해야 V4L2에서 적용됨, 지원하지 않는 백엔드는 무시)
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                 self.cap.set(cv2.CAP_PROP_FPS, 30)
@@ -244,15 +437,22 @@ class CameraThread(QThread):
                 print(f"카메라 설정 경고: {e}")
 
             frame_count = 0
-            while self.running:
+            # 다음 프레임을 표시할 시각 (매번 now + 간격이 아니라 이전 기준 + 간격으로 누적해
+            # 카메라 프레임 간격에 맞춰 반올림되며 생기는 지연이 쌓이지 않게 함)
+            next_emit = 0.0
+            while not self._stop_event.is_set():
                 try:
-                    self.mutex.lock()
-                    if not self.running:
-                        self.mutex.unlock()
-                        break
-
-                    ret, frame = self.cap.read()
-                    self.mutex.unlock()
+                    # grab()은 매번 호출해 드라이버 큐를 비우고(디코딩 없음),
+                    # 표시 주기가 됐을 때만 retrieve(dst)로 미리 할당된 버퍼에 디코딩
+                    ret = self.cap.grab()
+                    now = time.monotonic()
+                    if ret and now < next_emit:
+                        continue
+                    if ret:
+                        # 표시 직전에 큐에 남은 오래된 프레임을 버려 가장 최근 프레임을 디코딩
+                        ret = self.grab_latest()
+                    if ret:
+                        ret, frame = self.cap.retrieve(self.raw_frame)
 
                     if not ret or frame is None:
                         print("프레임 읽기 실패")
@@ -264,14 +464,19 @@ class CameraThread(QThread):
                         print("잘못된 프레임 형식")
                         continue
 
-                    # 안전한 색상 변환
-                    try:
-                        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        if rgb_frame is not None and rgb_frame.size > 0:
-                            self.frame_ready.emit(rgb_frame.copy())  # 안전한 복사본 전달
-                    except Exception as e:
-                        print(f"색상 변환 오류: {e}")
-                        continue
+                    self.raw_frame = frame
+
+                    # 축소/좌우반전은 GUI 스레드가 아닌 여기서 수행 (결과는 큐의 버퍼에 기록)
+                    # BGR 그대로 전달 (Qt 5.14+는 Format_BGR888로 표시하므로 색상 변환 불필요)
+                    next_emit += self.frame_interval
+                    if next_emit <= now:
+                        # 첫 프레임이거나 한 주기 이상 밀렸으면 밀린 만큼 몰아서 보내지 않고 기준을 다시 잡음
+                        next_emit = now + self.frame_interval
+                    self.frame_queue.put(frame)  # 이전 프레임이 남아 있으면 자동으로 버려짐
+
+                    # GUI가 실제로 그릴 때까지(최대 한 표시 주기) 기다려 GUI 처리 속도에 맞춤
+                    # (기다리는 동안 쌓인 드라이버 프레임은 다음 grab_latest()가 버림)
+                    self.frame_queue.wait_consumed(self.frame_interval)
 
                     frame_count += 1
                     if frame_count % 30 == 0:  # 30프레임마다 디버그
@@ -279,16 +484,26 @@ class CameraThread(QThread):
 
                 except Exception as e:
                     print(f"프레임 처리 오류: {e}")
-                    if self.mutex.tryLock():
-                        self.mutex.unlock()
-
-                time.sleep(0.033)  # 약 30 FPS
 
         except Exception as e:
             self.error_occurred.emit(f"카메라 스레드 오류: {str(e)}")
         finally:
             self.cleanup()
 
+    def grab_latest(self):
+        """드라이버 큐에 이미 쌓여 있는 프레임을 grab()으로 흘려보내고 최신 프레임에서 멈춤
+
+        CAP_PROP_BUFFERSIZE=1을 무시하는 백엔드에서도 표시 지연이 한 프레임을 넘지 않도록 함.
+        grab()이 즉시 반환되면 큐에 있던 프레임이므로 계속 버리고, 새 프레임을 기다렸다면 그것이 최신이다.
+        """
+        for _ in range(CAMERA_MAX_STALE_FRAMES):
+            started = time.monotonic()
+            if not self.cap.grab():
+                return False
+            if time.monotonic() - started >= CAMERA_STALE_GRAB_SECONDS:
+                break
+        return True
+
     def cleanup(self):
         """안전한 리소스 정리"""
         try:
@@ -302,16 +517,47 @@ class CameraThread(QThread):
     def stop(self):
         """안전한 스레드 정지"""
         print("[DEBUG] 카메라 스레드 정지 요청")
-        self.mutex.lock()
-        self.running = False
-        self.mutex.unlock()
+        self._stop_event.set()
 
-        self.cleanup()
+        # 카메라 해제는 run()의 finally에서 캡처 스레드가 직접 수행
+        # (grab() 도중에 다른 스레드에서 release하지 않도록)
         self.quit()
-        self.wait(3000)  # 최대 3초 대기
+        if self.wait(3000):  # 최대 3초 대기
+            self.cleanup()
 
 class MainWindow(QMainWindow):
     """메인 윈도우"""
+
+    # 상태별 버튼 활성화 여부: (시작 버튼, 중지 버튼)
+    _UI_STATES = {
+        "ready": (True, False),
+        "analyzing": (False, True),
+    }
+
+    # 운동 선택 버튼 스타일 (선택됨 / 선택 안 됨)
+    _CHECKED_QSS = """
+        QPushButton {
+            background-color: #808080;
+            color: white;
+            border: 2px solid #666666;
+            border-radius: 8px;
+            padding: 15px;
+            font-weight: bold;
+            font-size: 14px;
+        }
+    """
+    _UNCHECKED_QSS = """
+        QPushButton {
+            background-color: white;
+            color: #333333;
+            border: 2px solid #cccccc;
+            border-radius: 8px;
+            padding: 15px;
+            font-weight: bold;
+            font-size: 14px;
+        }
+    """
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("운동 자세 분석 시스템")
@@ -320,18 +566,47 @@ class MainWindow(QMainWindow):
         # 변수 초기화
         self.duration_seconds = 60
         self.selected_exercise = None
-        self.analyzer_thread = None
         self.camera_thread = None
+        # 제한 시간 안에 끝나지 않은 카메라 스레드 (finished 시그널을 받을 때까지 참조를 유지해야 함)
+        self._retiring_cameras = []
         self.is_analyzing = False
 
-        # 경과 시간 타이머
+        # 카메라/분석 스레드 -> GUI 프레임 전달 (프레임마다 이벤트를 쌓지 않고 최신 1장만 유지)
+        self.frame_queue = PreviewFrameQueue()
+        self._current_frame = None  # 현재 표시 중인 QImage의 실제 메모리(ndarray) 참조
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.drain_frame_queue)
+        self.frame_timer.start(FRAME_DRAIN_INTERVAL_MS)
+
+        # 분석 워커는 한 번만 만들고 작업마다 재사용
+        # (워커 스레드 -> GUI 스레드 시그널이므로 연결 방식을 QueuedConnection으로 명시)
+        self._pending_status = None  # 아직 표시하지 않은 최신 상태 메시지
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.setInterval(STATUS_UPDATE_INTERVAL_MS)
+        self.status_timer.timeout.connect(self.flush_status)
+        self.analyzer_worker = AnalyzerWorker(self.frame_queue)
+        self.analyzer_worker.status_updated.connect(self.update_status, Qt.QueuedConnection)
+        self.analyzer_worker.analysis_finished.connect(self.on_analysis_finished, Qt.QueuedConnection)
+        self.analyzer_worker.error_occurred.connect(self.on_analysis_error, Qt.QueuedConnection)
+        self.analyzer_worker.start()
+
+        # 경과 시간 (별도 1초 타이머 없이 프레임 표시 타이머에서 함께 갱신)
         self.elapsed_time = 0
-        self.analysis_timer = QTimer(self)
-        self.analysis_timer.timeout.connect(self.update_timer_display)
+        self.analysis_started_at = None  # 분석 중일 때만 시작 시각(monotonic)
 
         self.init_ui()
         self.start_camera()
 
+    def start_module_preload(self, exercise_type):
+        """선택한 운동의 분석 모듈 미리 불러오기 작업을 전역 스레드 풀에 등록 (모듈마다 한 번만)"""
+        module_name = ANALYZER_MODULE_NAMES[exercise_type]
+        if module_name in _preload_events:
+            return
+        done_event = threading.Event()
+        _preload_events[module_name] = done_event
+        QThreadPool.globalInstance().start(AnalyzerPreloadRunnable(module_name, done_event))
+
     def init_ui(self):
         """UI 초기화"""
         central_widget = QWidget()
@@ -346,6 +621,10 @@ class MainWindow(QMainWindow):
         right_panel = self.create_right_panel()
         main_layout.addWidget(right_panel, 2)
 
+        # 알림 창은 한 번만 만들어 두고 재사용 (팝업마다 아이콘/스타일 로드 방지)
+        self.info_box = QMessageBox(QMessageBox.Information, "분석 완료", "", QMessageBox.Ok, self)
+        self.error_box = QMessageBox(QMessageBox.Critical, "오류", "", QMessageBox.Ok, self)
+
     def create_left_panel(self):
         left_panel = QFrame()
         left_panel.setFrameStyle(QFrame.Box)
@@ -436,12 +715,18 @@ class MainWindow(QMainWindow):
         camera_layout.addWidget(self.camera_label)
         right_layout.addWidget(camera_group)
 
+        # 프레임마다 size()를 묻지 않도록 라벨 크기를 캐시하고 resize 이벤트에서만 갱신
+        # (같은 크기를 frame_queue에도 알려 producer 스레드에서 미리 축소)
+        self.set_camera_label_size(self.camera_label.size())
+        self.camera_label.installEventFilter(self)
+
         # 결과 그룹
         result_group = QGroupBox("분석 결과")
         result_layout = QVBoxLayout(result_group)
 
         self.result_text = QTextEdit()
         self.result_text.setReadOnly(True)
+        self.result_text.setAcceptRichText(False)  # 리포트는 일반 텍스트이므로 HTML 처리 경로 사용 안 함
         self.result_text.setMaximumHeight(150)
 
         result_layout.addWidget(self.result_text)
@@ -450,72 +735,112 @@ class MainWindow(QMainWindow):
         return right_panel
 
     def start_camera(self):
-        """카메라 시작"""
+        """카메라 시작 (이전 카메라 스레드가 아직 종료 중이면 끝난 뒤에 시작)"""
+        if self.is_analyzing:
+            return  # 재시도 대기 중에 분석이 시작된 경우 (카메라는 분석 모듈이 사용)
+        if self.camera_thread is not None and self.camera_thread.isRunning():
+            return
+        if self._retiring_cameras:
+            # 이전 스레드가 카메라 장치를 놓기 전에 새 스레드가 같은 장치를 열지 않도록 나중에 다시 시도
+            QTimer.singleShot(CAMERA_RESTART_RETRY_MS, self.start_camera)
+            return
         try:
-            self.camera_thread = CameraThread()
-            self.camera_thread.frame_ready.connect(self.update_camera_frame)
-            self.camera_thread.error_occurred.connect(self.on_camera_error)
+            self.camera_thread = CameraThread(self.frame_queue)
+            self.camera_thread.error_occurred.connect(self.on_camera_error, Qt.QueuedConnection)
             self.camera_thread.start()
         except Exception as e:
             self.on_camera_error(f"카메라 시작 실패: {str(e)}")
 
-    def update_camera_frame(self, frame):
-        """카메라 프레임 업데이트"""
-        # print(f"[DEBUG] update_camera_frame 호출됨: {frame.shape}")  # 디버깅
+    def retire_camera_thread(self, thread):
+        """제시간에 끝나지 않은 카메라 스레드를 종료될 때까지 보관
+
+        실행 중인 QThread의 마지막 참조가 사라지면 Qt가 프로세스를 중단시키므로,
+        finished 시그널을 받을 때까지 참조를 유지한다.
+        """
+        self._retiring_cameras.append(thread)
+        thread.finished.connect(self.reap_camera_threads, Qt.QueuedConnection)
+        if thread.isFinished():  # 연결하기 직전에 끝난 경우
+            self.reap_camera_threads()
+
+    @pyqtSlot()
+    def reap_camera_threads(self):
+        """종료된 카메라 스레드를 보관 목록에서 제거"""
+        self._retiring_cameras = [t for t in self._retiring_cameras if not t.isFinished()]
+
+    @pyqtSlot()
+    def drain_frame_queue(self):
+        """프레임 큐에 새 프레임이 있으면 가져와 표시 (분석 중이면 경과 시간도 함께 갱신)"""
+        if self.analysis_started_at is not None:
+            self.update_timer_display()
+        try:
+            qt_image, frame = self.frame_queue.pop()
+        except IndexError:
+            return
+        # QImage가 가리키는 배열을 다음 프레임까지 붙잡아 두어 표시 중 메모리가 해제되지 않게 함
+        self._current_frame = frame
+        self.update_camera_frame(qt_image)
+
+    def update_camera_frame(self, qt_image):
+        """카메라 프레임 업데이트 (frame_queue가 미리 만든 QImage 표시)"""
         try:
             # 안전한 프레임 처리
-            if frame is None or frame.size == 0:
+            if qt_image is None or qt_image.isNull():
                 # print("[DEBUG] 빈 프레임 수신")
                 return
 
-            # 좌우반전 적용 - 사용자와 텍스트 모두 반전
-            frame = cv2.flip(frame, 1)
-
-            h, w, ch = frame.shape
-
-            # 안전한 메모리 접근
-            if h <= 0 or w <= 0 or ch <= 0:
-                # print(f"[DEBUG] 잘못된 프레임 크기: {h}x{w}x{ch}")
-                return
-
-            bytes_per_line = ch * w
-
-            # QImage 생성 시 안전장치
-            qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-
-            if qt_image.isNull():
-                # print("[DEBUG] QImage 생성 실패")
-                return
-
-            pixmap = QPixmap.fromImage(qt_image)
-
-            if pixmap.isNull():
-                # print("[DEBUG] QPixmap 생성 실패")
-                return
-
-            # 라벨 크기 확인
-            label_size = self.camera_label.size()
-            if label_size.width() <= 0 or label_size.height() <= 0:
-                # print(f"[DEBUG] 잘못된 라벨 크기: {label_size}")
-                return
-
-            scaled_pixmap = pixmap.scaled(
-                label_size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.camera_label.setPixmap(scaled_pixmap)
+            # 라벨 크기에 맞춰 미리 만들어 둔 표시 함수 호출
+            self.paint_frame(qt_image)
+            self.frame_queue.mark_consumed()
             # print("[DEBUG] 프레임 표시 성공!")  # 디버깅
         except Exception as e:
             print(f"프레임 업데이트 오류: {e}")
-            import traceback
             traceback.print_exc()
 
+    def set_camera_label_size(self, size):
+        """라벨 크기가 바뀔 때만 호출 - 크기 검사를 미리 끝낸 표시 함수(paint_frame)를 만들어 둠"""
+        self.camera_label_size = size
+        width, height = size.width(), size.height()
+        self.frame_queue.target_size = (width, height)
+        if width <= 0 or height <= 0:
+            # print(f"[DEBUG] 잘못된 라벨 크기: {size}")
+            self.paint_frame = lambda qt_image: None
+        else:
+            self.paint_frame = functools.partial(self._paint_fitted_frame, width, height)
+
+    def _paint_fitted_frame(self, max_width, max_height, qt_image):
+        """라벨 크기(max_width x max_height)가 고정된 상태에서 프레임 표시"""
+        pixmap = QPixmap.fromImage(qt_image)
+
+        if pixmap.isNull():
+            # print("[DEBUG] QPixmap 생성 실패")
+            return
+
+        # 보통은 frame_queue에서 이미 라벨 크기로 축소되어 오므로 그대로 표시
+        if qt_image.width() <= max_width and qt_image.height() <= max_height:
+            self.camera_label.setPixmap(pixmap)
+            return
+
+        # 라벨 크기가 막 바뀐 직후 등 크기가 맞지 않을 때만 빠른(최근접) 스케일링
+        scaled_pixmap = pixmap.scaled(
+            self.camera_label_size,
+            Qt.KeepAspectRatio,
+            Qt.FastTransformation
+        )
+        self.camera_label.setPixmap(scaled_pixmap)
+
+    def eventFilter(self, obj, event):
+        """카메라 라벨 크기가 바뀔 때만 캐시된 크기 갱신"""
+        if obj is self.camera_label and event.type() == QEvent.Resize:
+            self.set_camera_label_size(event.size())
+        return super().eventFilter(obj, event)
+
+    @pyqtSlot(str)
     def on_camera_error(self, error_msg):
         """카메라 에러 처리"""
         self.camera_label.setText(f"카메라 오류: {error_msg}")
         self.status_label.setText("카메라 연결 실패")
 
+    @pyqtSlot(int)
     def update_duration(self, value):
         """분석 시간 업데이트"""
         self.duration_seconds = value
@@ -537,69 +862,62 @@ class MainWindow(QMainWindow):
         self.update_button_styles()
 
         # 상태 메시지 업데이트
-        exercise_names = {"squat": "스쿼트", "lunge": "런지", "plank": "플랭크"}
-        self.status_label.setText(f"{exercise_names.get(exercise_type, '')} 분석 준비됨")
+        self.status_label.setText(f"{EXERCISE_DISPLAY_NAMES.get(exercise_type, '')} 분석 준비됨")
+
+        # 분석 시작 시 모듈 로드 지연이 없도록 선택한 운동의 모듈만 백그라운드에서 미리 import
+        self.start_module_preload(exercise_type)
 
         # 기본 시간 설정
         default_duration = 60
         self.duration_spinbox.setValue(default_duration)
 
     def update_button_styles(self):
-        """버튼 스타일 업데이트"""
-        buttons = [self.squat_button, self.lunge_button, self.plank_button]
-
-        for button in buttons:
-            if button.isChecked():
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #808080;
-                        color: white;
-                        border: 2px solid #666666;
-                        border-radius: 8px;
-                        padding: 15px;
-                        font-weight: bold;
-                        font-size: 14px;
-                    }
-                """)
-            else:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: white;
-                        color: #333333;
-                        border: 2px solid #cccccc;
-                        border-radius: 8px;
-                        padding: 15px;
-                        font-weight: bold;
-                        font-size: 14px;
-                    }
-                """)
-
+        """버튼 스타일 업데이트 (스타일이 바뀐 버튼만 setStyleSheet 호출)"""
+        for button in (self.squat_button, self.lunge_button, self.plank_button):
+            style = self._CHECKED_QSS if button.isChecked() else self._UNCHECKED_QSS
+            # setStyleSheet는 위젯 스타일을 다시 계산하므로 같은 스타일이면 건너뜀
+            if button.styleSheet() != style:
+                button.setStyleSheet(style)
+
+    def update_ui_state(self, state):
+        """상태 이름에 맞게 제어 버튼 활성화 상태 적용"""
+        start_enabled, stop_enabled = self._UI_STATES[state]
+        self.start_button.setEnabled(start_enabled)
+        self.stop_button.setEnabled(stop_enabled)
+
+    @pyqtSlot()
     def start_analysis(self):
         """분석 시작 - macOS 안정성 강화"""
         if not self.selected_exercise:
             QMessageBox.warning(self, "경고", "운동을 선택해주세요.")
             return
 
+        # 지연 시작(1초) 동안 다시 눌려 작업이 중복으로 들어가지 않도록 바로 비활성화
+        self.start_button.setEnabled(False)
+
         try:
             # 분석 중 상태로 변경
             self.is_analyzing = True
 
+            # 모듈을 아직 불러오는 중이면 GUI를 막지 않고 안내만 표시 (워커가 준비될 때까지 대기 후 시작)
+            if is_module_preloading(ANALYZER_MODULE_NAMES[self.selected_exercise]):
+                self.status_label.setText("분석 모듈 불러오는 중... 준비되면 자동으로 시작합니다.")
+
             # 카메라 안전하게 중지
             print("[DEBUG] 카메라 스레드 중지 시작...")
             if self.camera_thread and self.camera_thread.isRunning():
                 self.camera_thread.stop()
                 # 카메라 완전히 중지될 때까지 대기
+                # (terminate()는 카메라 장치 핸들을 해제하지 못해 다음 분석에서 카메라를 열 수 없게 되므로 사용하지 않음)
                 if not self.camera_thread.wait(5000):  # 5초 대기
-                    print("[WARNING] 카메라 스레드가 정상적으로 종료되지 않음")
-                    self.camera_thread.terminate()
-                    self.camera_thread.wait(2000)
+                    print("[WARNING] 카메라 스레드가 아직 종료 중입니다. 현재 프레임을 마치면 스스로 종료됩니다.")
+                    self.status_label.setText("카메라 종료 대기 중...")
+                    self.retire_camera_thread(self.camera_thread)
+                    self.camera_thread = None
 
+            self.frame_queue.clear()  # 남은 카메라 프레임이 안내 문구를 덮어쓰지 않도록
             self.camera_label.setText("분석 준비 중... 잠시 기다려주세요.")
 
-            # 메모리 정리
-            import gc
-            gc.collect()
-
             # 약간의 지연으로 메모리 안정화
             QTimer.singleShot(1000, self._start_analysis_delayed)
 
@@ -607,118 +925,122 @@ class MainWindow(QMainWindow):
             print(f"분석 시작 준비 오류: {e}")
             self.on_analysis_error(f"분석 시작 준비 중 오류: {str(e)}")
 
+    @pyqtSlot()
     def _start_analysis_delayed(self):
         """지연된 분석 시작 - 메모리 안정화 후"""
         try:
             # 타이머 초기화 및 시작
             self.elapsed_time = 0
             self.timer_label.setText("경과 시간: 0초")
-            self.analysis_timer.start(1000)
+            self.analysis_started_at = time.monotonic()
 
-            # 분석 스레드 시작 (안전한 지연 시작)
+            # 분석 작업 시작 (안전한 지연 시작)
             duration = self.duration_spinbox.value()
-            self.analyzer_thread = ExerciseAnalyzerThread(self.selected_exercise, duration)
-
-            self.analyzer_thread.status_updated.connect(self.update_status)
-            self.analyzer_thread.analysis_finished.connect(self.on_analysis_finished)
-            self.analyzer_thread.error_occurred.connect(self.on_analysis_error)
-            self.analyzer_thread.frame_processed.connect(self.update_camera_frame)
-
-            self.analyzer_thread.start()
+            self.analyzer_worker.submit(AnalysisJob(self.selected_exercise, duration))
 
             # UI 상태 업데이트
-            self.start_button.setEnabled(False)
-            self.stop_button.setEnabled(True)
+            self.update_ui_state("analyzing")
             self.status_label.setText("분석이 시작되었습니다...")
 
         except Exception as e:
             print(f"지연된 분석 시작 오류: {e}")
             self.on_analysis_error(f"분석 시작 오류: {str(e)}")
 
+    @pyqtSlot()
     def stop_analysis(self, finished_naturally=False):
         """분석 중지"""
-        # 분석 스레드 중지
-        if self.analyzer_thread and self.analyzer_thread.isRunning():
-            self.analyzer_thread.stop()
+        # 분석 스레드 중지 (제한 시간 내에 끝나지 않으면 UI를 막지 않고 진행)
+        stopped_cleanly = True
+        if self.analyzer_worker.is_busy():
+            stopped_cleanly = self.analyzer_worker.stop()
 
         # 상태 초기화
         self.is_analyzing = False
-        self.analysis_timer.stop()
+        self.analysis_started_at = None
+        self._pending_status = None  # 늦게 도착한 분석 상태 메시지가 완료/중지 문구를 덮어쓰지 않도록
 
         # 카메라 재시작
         self.start_camera()
 
         # UI 상태 복원
-        self.start_button.setEnabled(True)
-        self.stop_button.setEnabled(False)
+        self.update_ui_state("ready")
 
-        if not finished_naturally:
+        if not stopped_cleanly:
+            self.status_label.setText("분석 종료 대기 중... (카메라가 잠시 사용 중일 수 있습니다)")
+        elif not finished_naturally:
             self.status_label.setText("분석이 중지되었습니다.")
 
+    @pyqtSlot(str)
     def update_status(self, status_msg):
-        """상태 업데이트"""
-        self.status_label.setText(status_msg)
-
-    def on_analysis_finished(self, video_path, report_path):
-        """분석 완료 처리"""
+        """상태 업데이트 (바로 그리지 않고 최신 메시지만 보관했다가 타이머에서 한 번에 표시)"""
+        self._pending_status = status_msg
+        if not self.status_timer.isActive():
+            self.status_timer.start()
+
+    @pyqtSlot()
+    def flush_status(self):
+        """보관 중인 최신 상태 메시지를 라벨에 표시"""
+        if self._pending_status is not None:
+            self.status_label.setText(self._pending_status)
+            self._pending_status = None
+
+    @pyqtSlot(str, str, str)
+    def on_analysis_finished(self, video_path, report_path, report_content):
+        """분석 완료 처리 (리포트 내용은 워커 스레드에서 이미 읽어 둠)"""
         self.stop_analysis(finished_naturally=True)
 
+        # 파일 이름/위치는 한 번만 계산해서 요약과 알림에서 재사용
+        video_dir, _, video_name = video_path.rpartition(os.sep)
+        report_name = report_path.rsplit(os.sep, 1)[-1]
+
         # 결과 요약
-        summary = f"""분석 완료!
+        result_summary = f"""분석 완료!
 
-📹 비디오: {os.path.basename(video_path)}
-📄 리포트: {os.path.basename(report_path)}
-📁 위치: {os.path.dirname(video_path)}
+📹 비디오: {video_name}
+📄 리포트: {report_name}
+📁 위치: {video_dir}
 """
 
-        # 리포트 내용 읽기
-        try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                report_content = f.read()
-
-            full_result = summary + "\n" + "="*50 + "\n상세 분석 결과\n" + "="*50 + "\n\n" + report_content
-            self.result_text.setText(full_result)
-        except Exception as e:
-            self.result_text.setText(summary + f"\n리포트 파일을 읽을 수 없습니다: {e}")
+        full_result = result_summary + "\n" + "="*50 + "\n상세 분석 결과\n" + "="*50 + "\n\n" + report_content
+        self.result_text.setPlainText(full_result)
 
         # 상태 및 알림
         self.status_label.setText("분석 완료!")
-        QMessageBox.information(
-            self,
-            "분석 완료",
-            f"분석이 완료되었습니다!\n\n비디오: {os.path.basename(video_path)}\n리포트: {os.path.basename(report_path)}"
-        )
+        self.info_box.setText(f"분석이 완료되었습니다!\n\n비디오: {video_name}\n리포트: {report_name}")
+        self.info_box.exec_()
 
+    @pyqtSlot(str)
     def on_analysis_error(self, error_msg):
         """분석 오류 처리"""
         self.stop_analysis(finished_naturally=True)
 
-        self.result_text.setText(f"분석 오류: {error_msg}")
+        self.result_text.setPlainText(f"분석 오류: {error_msg}")
         self.status_label.setText("분석 실패")
 
-        QMessageBox.critical(
-            self,
-            "오류",
-            f"분석 중 오류가 발생했습니다:\n{error_msg}"
-        )
+        self.error_box.setText(f"분석 중 오류가 발생했습니다:\n{error_msg}")
+        self.error_box.exec_()
 
     def update_timer_display(self):
-        """타이머 표시 업데이트"""
-        self.elapsed_time += 1
-        self.timer_label.setText(f"경과 시간: {self.elapsed_time}초")
+        """타이머 표시 업데이트 (초 값이 바뀔 때만 라벨 갱신)"""
+        elapsed = int(time.monotonic() - self.analysis_started_at)
+        if elapsed != self.elapsed_time:
+            self.elapsed_time = elapsed
+            self.timer_label.setText(f"경과 시간: {self.elapsed_time}초")
 
     def closeEvent(self, event):
         """애플리케이션 종료 시 정리"""
         # 모든 스레드 정리
         if self.camera_thread and self.camera_thread.isRunning():
             self.camera_thread.stop()
+        for thread in self._retiring_cameras:
+            thread.wait(1000)
 
-        if self.analyzer_thread and self.analyzer_thread.isRunning():
-            self.analyzer_thread.stop()
+        self.analyzer_worker.shutdown()
 
         # 타이머 정리
-        if self.analysis_timer.isActive():
-            self.analysis_timer.stop()
+        self.analysis_started_at = None
+        if self.frame_timer.isActive():
+            self.frame_timer.stop()
 
         event.accept()
 
@@ -738,10 +1060,6 @@ def main():
         app.setAttribute(Qt.AA_DontCreateNativeWidgetSiblings, True)
         app.setStyle('Fusion')  # 안정한 스타일
 
-        # 메모리 관리 강화
-        import gc
-        gc.set_threshold(700, 10, 10)  # 더 자주 가비지 컬렉션
-
         print("[DEBUG] 메인 윈도우 생성 중...")
         window = MainWindow()
 
@@ -754,11 +1072,9 @@ def main():
             try:
                 if hasattr(window, 'camera_thread') and window.camera_thread:
                     window.camera_thread.stop()
-                if hasattr(window, 'analyzer_thread') and window.analyzer_thread:
-                    window.analyzer_thread.stop()
+                if hasattr(window, 'analyzer_worker') and window.analyzer_worker:
+                    window.analyzer_worker.shutdown()
 
-                # 메모리 정리
-                gc.collect()
                 print("[DEBUG] 리소스 정리 완료")
             except Exception as e:
                 print(f"종료 중 오류: {e}")
@@ -780,7 +1096,6 @@ def main():
 
     except Exception as e:
         print(f"메인 함수 오류: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 